@@ -2,110 +2,195 @@
 Generate a ghost icon for GhostWriter
 Creates a higher quality, modern 3D-style ghost icon with gradient and shadow
 """
+import hashlib
+import math
+import os
+import struct
+from io import BytesIO
+
+import PIL
 from PIL import Image, ImageDraw
 
-def create_ghost_icon():
-    # Create sizes for ICO file
-    sizes = [16, 32, 48, 64, 128, 256]
-    images = []
-    
-    for size in sizes:
-        # Create transparent image
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Calculate safe area (padding for shadow)
-        padding = size // 6
-        w = size - (padding * 2)
-        h = size - padding
-        x = padding
-        y = padding // 2
-        
-        # Draw Drop Shadow
-        shadow_offset = size // 20
-        shadow_color = (0, 0, 0, 80)
-        
-        # Shadow body
-        draw.ellipse([x + shadow_offset, y + shadow_offset, 
-                     x + w + shadow_offset, y + h + shadow_offset], 
-                    fill=shadow_color)
-        
-        # Main Ghost Body (White to very light blue gradient simulation)
-        # We'll just draw solid white for simplicity but cleaner shape
-        body_color = (255, 255, 255, 255)
-        
-        # Upper body (Circle)
-        draw.ellipse([x, y, x + w, y + int(h * 0.8)], fill=body_color)
-        
-        # Lower body (Rect)
-        rect_top = y + int(h * 0.4)
-        rect_bottom = y + h - (w // 6)
-        draw.rectangle([x, rect_top, x + w, rect_bottom + 1], fill=body_color)
-        
-        # Wavy bottom
-        wave_height = w // 6
-        wave_width = w // 3
-        
-        # Three bumps at bottom
-        for i in range(3):
-            wx = x + (i * wave_width)
-            wy = rect_bottom
-            draw.ellipse([wx, wy - wave_height//2, 
-                         wx + wave_width, wy + wave_height//2], 
-                        fill=body_color)
-        
-        # Cute Eyes (Larger, slightly oval)
-        eye_width = w // 7
-        eye_height = w // 5
-        eye_y = y + int(h * 0.35)
-        
-        left_eye_x = x + int(w * 0.28)
-        right_eye_x = x + int(w * 0.72)
-        eye_color = (40, 42, 54, 255)  # Dark slate
-        
-        # Left Eye
-        draw.ellipse([left_eye_x - eye_width, eye_y - eye_height,
-                     left_eye_x + eye_width, eye_y + eye_height],
-                    fill=eye_color)
-                    
-        # Right Eye
-        draw.ellipse([right_eye_x - eye_width, eye_y - eye_height,
-                     right_eye_x + eye_width, eye_y + eye_height],
+STAMP_FILE = '.ghost_icon.stamp'
+
+# Shape proportions, relative to the ghost's width/height
+GHOST_GEOMETRY = dict(
+    head_h_ratio=0.8,        # Head ellipse height
+    eye_y_ratio=0.35,        # Eye center, down from the top
+    left_eye_x_ratio=0.28,   # Left eye center, across from the left
+    right_eye_x_ratio=0.72,  # Right eye center, across from the left
+)
+
+def _draw_ghost(size=256):
+    """Draw the ghost once at the given size and return an RGBA image"""
+    # Create transparent image
+    img = Image.new('RGBA', (size, size), 0)
+    draw = ImageDraw.Draw(img)
+    
+    # Calculate safe area (padding for shadow)
+    padding = size // 6
+    w = size - (padding * 2)
+    h = size - padding
+    x = padding
+    y = padding // 2
+    
+    # Draw Drop Shadow
+    shadow_offset = size // 20
+    shadow_color = (0, 0, 0, 80)
+    
+    # Shadow body
+    draw.ellipse([x + shadow_offset, y + shadow_offset, 
+                 x + w + shadow_offset, y + h + shadow_offset], 
+                fill=shadow_color)
+    
+    # Main Ghost Body (White to very light blue gradient simulation)
+    # We'll just draw solid white for simplicity but cleaner shape
+    body_color = (255, 255, 255, 255)
+    
+    # Upper body (Circle)
+    head_bottom = y + int(h * GHOST_GEOMETRY['head_h_ratio'])
+    head_cx = x + w / 2
+    head_cy = (y + head_bottom) / 2
+    head_rx = w / 2
+    head_ry = (head_bottom - y) / 2
+    
+    # Lower body (Rect)
+    rect_bottom = y + h - (w // 6)
+    
+    # Wavy bottom
+    wave_height = w // 6
+    wave_width = w // 3
+    
+    # Trace the whole outline and fill it in one call instead of
+    # overlapping ellipse/rectangle draws
+    points = []
+    
+    # Top of the head, left to right
+    head_steps = max(16, size // 4)
+    for i in range(head_steps + 1):
+        a = math.pi + math.pi * i / head_steps
+        points.append((head_cx + head_rx * math.cos(a), head_cy + head_ry * math.sin(a)))
+    
+    # Right side down
+    points.append((x + w, rect_bottom + 1))
+    
+    # Three bumps at bottom, right to left
+    bump_steps = max(8, size // 16)
+    for i in reversed(range(3)):
+        bump_cx = x + (i * wave_width) + wave_width / 2
+        for j in range(bump_steps + 1):
+            a = math.pi * j / bump_steps
+            points.append((bump_cx + (wave_width / 2) * math.cos(a),
+                           rect_bottom + (wave_height // 2) * math.sin(a)))
+    
+    draw.polygon(points, fill=body_color)
+    
+    # Cute Eyes (Larger, slightly oval)
+    eye_width = w // 7
+    eye_height = w // 5
+    eye_y = y + int(h * GHOST_GEOMETRY['eye_y_ratio'])
+    
+    left_eye_x = x + int(w * GHOST_GEOMETRY['left_eye_x_ratio'])
+    right_eye_x = x + int(w * GHOST_GEOMETRY['right_eye_x_ratio'])
+    eye_color = (40, 42, 54, 255)  # Dark slate
+    
+    # Both eyes, drawn back to back so each color is filled in one run
+    for eye_x in (left_eye_x, right_eye_x):
+        draw.ellipse([eye_x - eye_width, eye_y - eye_height,
+                     eye_x + eye_width, eye_y + eye_height],
                     fill=eye_color)
-        
-        # Shine in eyes (small white dots)
-        shine_size = max(1, eye_width // 3)
-        shine_offset_x = eye_width // 2
-        shine_offset_y = eye_height // 2
-        
-        draw.ellipse([left_eye_x + shine_offset_x - shine_size, eye_y - shine_offset_y - shine_size,
-                     left_eye_x + shine_offset_x + shine_size, eye_y - shine_offset_y + shine_size],
-                    fill=(255, 255, 255, 230))
-        
-        draw.ellipse([right_eye_x + shine_offset_x - shine_size, eye_y - shine_offset_y - shine_size,
-                     right_eye_x + shine_offset_x + shine_size, eye_y - shine_offset_y + shine_size],
-                    fill=(255, 255, 255, 230))
-        
-        # Blush (Pink cheeks)
-        cheek_size = eye_width
-        cheek_y = eye_y + eye_height
-        cheek_color = (255, 182, 193, 100) # Light pink transparent
-        
-        draw.ellipse([left_eye_x - cheek_size - (w//20), cheek_y,
-                     left_eye_x + cheek_size - (w//20), cheek_y + cheek_size],
-                    fill=cheek_color)
+    
+    # Translucent details go on their own layer and are blended in with a
+    # single alpha_composite (drawing them straight onto img would
+    # overwrite the pixels underneath instead of blending)
+    overlay = Image.new('RGBA', (size, size), 0)
+    overlay_draw = ImageDraw.Draw(overlay)
+    
+    # Shine in eyes (small white dots)
+    shine_size = max(1, eye_width // 3)
+    shine_offset_x = eye_width // 2
+    shine_offset_y = eye_height // 2
+    
+    shine_color = (255, 255, 255, 230)
+    for eye_x in (left_eye_x, right_eye_x):
+        overlay_draw.ellipse([eye_x + shine_offset_x - shine_size, eye_y - shine_offset_y - shine_size,
+                             eye_x + shine_offset_x + shine_size, eye_y - shine_offset_y + shine_size],
+                            fill=shine_color)
+    
+    # Blush (Pink cheeks)
+    cheek_size = eye_width
+    cheek_y = eye_y + eye_height
+    cheek_color = (255, 182, 193, 100) # Light pink transparent
+    
+    # Cheeks sit just outside each eye
+    for cheek_x in (left_eye_x - (w//20), right_eye_x + (w//20)):
+        overlay_draw.ellipse([cheek_x - cheek_size, cheek_y,
+                             cheek_x + cheek_size, cheek_y + cheek_size],
+                            fill=cheek_color)
+
+    img.alpha_composite(overlay)
 
-        draw.ellipse([right_eye_x - cheek_size + (w//20), cheek_y,
-                     right_eye_x + cheek_size + (w//20), cheek_y + cheek_size],
-                    fill=cheek_color)
+    return img
 
-        images.append(img)
+def _save_ico(path, images):
+    """Write images to an ICO file as PNG-compressed entries"""
+    # Encode each size once; fast zlib level since icons are tiny anyway
+    payloads = []
+    for im in images:
+        buf = BytesIO()
+        im.save(buf, 'PNG', optimize=False, compress_level=1)
+        payloads.append(buf.getvalue())
+    
+    # ICONDIR header, then one ICONDIRENTRY per image (256 is stored as 0)
+    header = struct.pack('<HHH', 0, 1, len(images))
+    offset = len(header) + 16 * len(images)
+    entries = []
+    for im, data in zip(images, payloads):
+        w, h = im.size
+        entries.append(struct.pack('<BBBBHHII', w % 256, h % 256, 0, 0, 1, 32,
+                                   len(data), offset))
+        offset += len(data)
+    
+    with open(path, 'wb') as f:
+        f.write(header + b''.join(entries) + b''.join(payloads))
+
+def _source_stamp():
+    """Hash of this script and the Pillow version, used to skip unchanged rebuilds"""
+    with open(__file__, 'rb') as f:
+        source = f.read()
+    return hashlib.blake2b(source + PIL.__version__.encode()).hexdigest()
+
+def create_ghost_icon():
+    # Skip the rebuild if the outputs came from this exact script + Pillow
+    stamp = _source_stamp()
+    if os.path.exists('ghost_icon.ico') and os.path.exists('ghost_icon.png'):
+        try:
+            with open(STAMP_FILE) as f:
+                if f.read() == stamp:
+                    print("ghost_icon.ico and ghost_icon.png are up to date")
+                    return
+        except OSError:
+            pass
+    
+    # Create sizes for ICO file
+    sizes = [16, 32, 48, 64, 128, 256]
+    
+    # Draw once at the largest size, then halve it down a mipmap chain
+    # (box filter is exact for 2x steps). 48 isn't a power-of-two step,
+    # so it is resampled straight from the full-size image.
+    base = _draw_ghost(sizes[-1])
+    mips = {base.width: base}
+    while min(mips) > sizes[0]:
+        level = mips[min(mips)]
+        half = level.width // 2
+        mips[half] = level.resize((half, half), Image.BOX)
+    images = [mips[s] if s in mips else base.resize((s, s), Image.LANCZOS) for s in sizes]
     
     # Save as ICO
-    images[0].save('ghost_icon.ico', format='ICO', 
-                   sizes=[(s, s) for s in sizes],
-                   append_images=images[1:])
+    _save_ico('ghost_icon.ico', images)
     images[-1].save('ghost_icon.png')
+    with open(STAMP_FILE, 'w') as f:
+        f.write(stamp)
     print("Created ghost_icon.ico and ghost_icon.png")
 
 if __name__ == "__main__":
@@ -53,7 +53,8 @@ def show_splash():
                             font=("Segoe UI", 12), bg='#1a1a2e', fg='#888888')
     loading_label.pack()
     
-    # Force display
+    # Force display (a full update, so the Expose/paint events that draw
+    # the labels are handled before the blocking imports that follow)
     splash.update()
     
     _splash_window = (root, splash)
@@ -92,27 +93,62 @@ import tempfile
 import subprocess
 import queue
 import winreg
+import math
+import struct
+import time
+import ctypes
+from ctypes import wintypes
+import codecs
 
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
 import pyperclip
-from pynput import keyboard
-from pynput.keyboard import Key, Controller
-import pystray
-from PIL import Image, ImageDraw
+
+# Audio, input and tray libraries are slow to import and not needed to
+# draw the main window, so they load after it is up (see load_deferred_modules)
+sd = None
+keyboard = Key = Controller = None
+pystray = None
+Image = ImageDraw = None
+
+
+def load_deferred_modules():
+    """Import the modules deferred past the first paint of the main window"""
+    global sd, keyboard, Key, Controller, pystray, Image, ImageDraw
+    import sounddevice as sd
+    from pynput import keyboard
+    from pynput.keyboard import Key, Controller
+    import pystray
+    from PIL import Image, ImageDraw
 
 # ============== CONSTANTS ==============
 APP_NAME = "GhostWriter"
 SETTINGS_FILE = "settings.json"
+SETTINGS_SAVE_DELAY_MS = 500  # Coalesce rapid settings changes into one write
 WHISPER_EXE = "whisper-cli.exe"
 MODEL_PATH = "ggml-tiny.bin"
+WHISPER_THREADS = min(os.cpu_count() or 4, 16)
+# Encoder context for short clips: 768 frames of 20ms (~15s) instead of the full 30s
+WHISPER_SHORT_AUDIO_CTX = 768
+WHISPER_SHORT_AUDIO_SECONDS = WHISPER_SHORT_AUDIO_CTX * 0.02
+# Whisper decodes 30s windows, so only longer clips have text to paste early
+WHISPER_STREAM_SECONDS = 30
 SAMPLE_RATE = 16000
+RECORD_BUFFER_SECONDS = 120  # Preallocated per recording, grows if exceeded
+AUDIO_BLOCKSIZE = 1600  # Frames per audio callback (100ms)
+
+# RIFF/WAVE header for mono 16-bit PCM at SAMPLE_RATE. The two size
+# fields (offsets 4 and 40) are left at 0 and patched per recording.
+WAV_HEADER = struct.pack(
+    '<4sI4s4sIHHIIHH4sI',
+    b'RIFF', 0, b'WAVE',
+    b'fmt ', 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16,
+    b'data', 0
+)
 
 DEFAULT_SETTINGS = {
     "hotkey": "F8",
     "sound_enabled": True,
-    "paste_delay": 0.15,
+    "paste_delay": 0.0,
     "start_minimized": False,
     "run_on_startup": False
 }
@@ -123,10 +159,18 @@ HOTKEY_OPTIONS = [
     "Ctrl+Shift+R", "Ctrl+Shift+D", "Ctrl+Alt+V"
 ]
 
+# Modifier bits for combo hotkeys
+MOD_CTRL = 1
+MOD_SHIFT = 2
+MOD_ALT = 4
+HOTKEY_MODIFIERS = {"Ctrl": MOD_CTRL, "Shift": MOD_SHIFT, "Alt": MOD_ALT}
+
+# Extra wait between copying and Ctrl+V, for apps that need time to catch up
 PASTE_DELAY_OPTIONS = [
+    ("Instant (Default)", 0.0),
     ("Fast (0.05s)", 0.05),
     ("Normal (0.10s)", 0.10),
-    ("Default (0.15s)", 0.15),
+    ("Medium (0.15s)", 0.15),
     ("Slow (0.25s)", 0.25),
     ("Very Slow (0.50s)", 0.50)
 ]
@@ -141,6 +185,19 @@ STATUS_RECORDING = "recording"
 STATUS_TRANSCRIBING = "transcribing"
 STATUS_ERROR = "error"
 
+STATUS_COLORS = {
+    STATUS_READY: '#888888',
+    STATUS_RECORDING: '#4CAF50',
+    STATUS_TRANSCRIBING: '#FFC107',
+    STATUS_ERROR: '#F44336'
+}
+
+# Indicator pulse: 30ms ticks, one full breath every PULSE_STEPS ticks (~1.3s)
+PULSE_INTERVAL_MS = 30
+PULSE_STEPS = 42
+RECORDING_PULSE = ((0x7f, 0xff, 0x7f), (0x2e, 0x8b, 0x57))     # Bright green <-> darker green
+TRANSCRIBING_PULSE = ((0xff, 0xeb, 0x3b), (0xff, 0x98, 0x00))  # Yellow <-> orange
+
 
 
 
@@ -149,6 +206,26 @@ SCRIPT_DIR = get_script_directory()
 os.chdir(SCRIPT_DIR)
 
 
+def interpolate_color(c1, c2, factor):
+    """Blend two (r, g, b) colors into #rrggbb, factor 0.0 = c1 and 1.0 = c2"""
+    r1, g1, b1 = c1
+    r2, g2, b2 = c2
+    r = int(r1 + (r2 - r1) * factor)
+    g = int(g1 + (g2 - g1) * factor)
+    b = int(b1 + (b2 - b1) * factor)
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def build_pulse_colors(c1, c2, steps=PULSE_STEPS):
+    """Precompute one sine-wave breath between two colors"""
+    colors = []
+    for i in range(steps):
+        # 0.0 to 1.0 sine wave
+        intensity = (math.sin(2 * math.pi * i / steps) + 1) / 2
+        colors.append(interpolate_color(c1, c2, intensity))
+    return colors
+
+
 class GhostIndicator:
     """Ghost-themed animated floating indicator"""
     
@@ -161,6 +238,12 @@ class GhostIndicator:
         self.alpha_step = 0
         self.status = "idle"
         
+        # Pulse colors per status, computed once instead of every frame
+        self.pulse_colors = {
+            'recording': build_pulse_colors(*RECORDING_PULSE),
+            'transcribing': build_pulse_colors(*TRANSCRIBING_PULSE),
+        }
+        
         self._create_popup()
     
     def _create_popup(self):
@@ -186,12 +269,13 @@ class GhostIndicator:
         # Initial resize
         self.popup.update_idletasks()
         
-        # Calculate safer center position
-        screen_width = self.popup.winfo_screenwidth()
-        screen_height = self.popup.winfo_screenheight()
+        # Calculate safer center position (screen size cached for show();
+        # on Windows this is always the primary screen's size)
+        self.screen_width = self.popup.winfo_screenwidth()
+        self.screen_height = self.popup.winfo_screenheight()
         
-        x = (screen_width - self.width) // 2
-        y = (screen_height - self.height) // 2  # DEAD CENTER for now to finding it
+        x = (self.screen_width - self.width) // 2
+        y = (self.screen_height - self.height) // 2  # DEAD CENTER for now to finding it
         
         self.popup.geometry(f"{self.width}x{self.height}+{x}+{y}")
         
@@ -255,35 +339,12 @@ class GhostIndicator:
         if self.status == 'idle':
             return
             
-        self.alpha_step += 0.15
-        
-        import math
-        # 0.0 to 1.0 sine wave
-        intensity = (math.sin(self.alpha_step) + 1) / 2
-        
-        # Color interpolation helper
-        def interpolate_color(c1, c2, factor):
-            r1, g1, b1 = int(c1[1:3], 16), int(c1[3:5], 16), int(c1[5:7], 16)
-            r2, g2, b2 = int(c2[1:3], 16), int(c2[3:5], 16), int(c2[5:7], 16)
-            r = int(r1 + (r2 - r1) * factor)
-            g = int(g1 + (g2 - g1) * factor)
-            b = int(b1 + (b2 - b1) * factor)
-            return f'#{r:02x}{g:02x}{b:02x}'
-            
-        if self.status == 'recording':
-            # Pulse between Bright Green and Darker Green
-            color = interpolate_color('#7fff7f', '#2e8b57', intensity)
-            self.canvas.itemconfig(self.text_id, fill=color)
-            
-            # Pulse subtle background border glow?
-            # For now just text pulse is clean
+        colors = self.pulse_colors.get(self.status)
+        if colors:
+            self.alpha_step = (self.alpha_step + 1) % PULSE_STEPS
+            self.canvas.itemconfig(self.text_id, fill=colors[self.alpha_step])
             
-        elif self.status == 'transcribing':
-            # Pulse between Yellow and Orange
-            color = interpolate_color('#ffeb3b', '#ff9800', intensity)
-            self.canvas.itemconfig(self.text_id, fill=color)
-            
-        self.animation_id = self.popup.after(30, self._animate)
+        self.animation_id = self.popup.after(PULSE_INTERVAL_MS, self._animate)
     
     def show(self, status):
         """Show popup with given status"""
@@ -300,38 +361,22 @@ class GhostIndicator:
         # Position at DEAD CENTER (Safe)
         self.popup.update_idletasks()
         try:
-            sw = self.popup.winfo_screenwidth()
-            sh = self.popup.winfo_screenheight()
+            sw = self.screen_width
+            sh = self.screen_height
             x = (sw - self.width) // 2
             
-            # 3/4th down (1/4th from bottom)
-            # FIX: Adjust for DPI Scaling
-            try:
-                scaling = ctk.ScalingTracker.get_widget_scaling(self.popup)
-            except:
-                scaling = 1.0
-                
-            y = int(sh * 0.75) 
-            
-            # Apply scaling manually if needed (heuristic)
-            if scaling > 1.0:
-                 # If screen reports logical but geometry expects physical
-                 # Or vice versa. Usually geometry expects logical on DPI-aware apps.
-                 pass 
-
-            # Force specific fallback if it looks wrong
-            # User says "Vertical Middle" (0.5) when we set 0.75.
-            # This implies we should target 1.0 to get 0.75? 
-            # Let's try pushing it further down.
+            # Near the bottom of the screen
+            # User says "Vertical Middle" (0.5) when we set 0.75 (DPI scaling?),
+            # so push it further down.
             y = int(sh * 0.85) 
             
             self.popup.geometry(f"+{x}+{y}")
         except:
             self.popup.geometry("+500+500") # Fallback
             
+        # -topmost was set once in _create_popup and sticks to the window
         self.popup.deiconify()
         self.popup.lift()
-        self.popup.attributes('-topmost', True)
         
         # Start animation
         if self.animation_id:
@@ -346,31 +391,134 @@ class GhostIndicator:
         if self.popup:
             self.popup.withdraw()
 
+
+def wav_bytes_pcm16(samples):
+    """Wrap mono int16 samples in an in-memory 16-bit PCM WAV"""
+    # One buffer for header + samples, so the audio is copied exactly once
+    header_size = len(WAV_HEADER)
+    data_size = samples.nbytes
+    wav_data = bytearray(header_size + data_size)
+    wav_data[:header_size] = WAV_HEADER
+    struct.pack_into('<I', wav_data, 4, header_size - 8 + data_size)
+    struct.pack_into('<I', wav_data, 40, data_size)
+    wav_data[header_size:] = memoryview(samples).cast('B')
+    return wav_data
+
+
+# ============== WIN32 PASTE ==============
+# Ctrl+V is sent as one SendInput batch of four prebuilt key events.
+# INPUT's union must include MOUSEINPUT (the largest member) for
+# sizeof(INPUT) to match what SendInput expects.
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+VK_CONTROL = 0x11
+VK_V = 0x56
+MAPVK_VK_TO_VSC = 0
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD)]
+
+
+class INPUT(ctypes.Structure):
+    class _INPUT(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+    _fields_ = [("type", wintypes.DWORD), ("input", _INPUT)]
+
+
+def _key_input(vk, flags=0):
+    # Fill in the scan code too, as pynput does; RDP/VM clients, games and
+    # browsers (KeyboardEvent.code) read it rather than the virtual key
+    scan = ctypes.windll.user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC)
+    return INPUT(type=INPUT_KEYBOARD,
+                 input=INPUT._INPUT(ki=KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)))
+
+
+CTRL_V_INPUTS = (INPUT * 4)(
+    _key_input(VK_CONTROL),
+    _key_input(VK_V),
+    _key_input(VK_V, KEYEVENTF_KEYUP),
+    _key_input(VK_CONTROL, KEYEVENTF_KEYUP),
+)
+
+
+def send_ctrl_v():
+    """Press and release Ctrl+V in one SendInput call; False if input was blocked"""
+    sent = ctypes.windll.user32.SendInput(len(CTRL_V_INPUTS), CTRL_V_INPUTS, ctypes.sizeof(INPUT))
+    return sent == len(CTRL_V_INPUTS)
+
+
 class GhostWriterApp:
     """Main application class for GhostWriter GUI"""
 
     def __init__(self):
         self.settings = DEFAULT_SETTINGS.copy()
         self.load_settings()
+        self.paste_delay = float(self.settings.get("paste_delay", 0.0))  # Kept in sync by on_delay_changed
 
         # State
         self.is_recording = False
-        self.audio_data = []
+        self.audio_buffer = None
+        self.audio_frames = 0
+        self.buffer_pool = []  # Reusable recording buffers
+        self.buffer_pool_lock = threading.Lock()
         self.last_transcription = ""
         self.current_status = STATUS_READY
         self.error_message = ""
+        # Whether this whisper build reads audio from stdin ("-f -");
+        # None until the first run finds out
+        self.whisper_reads_stdin = None
+        # Fixed part of the whisper command line (see run_whisper)
+        self.whisper_command = (
+            os.path.join(SCRIPT_DIR, WHISPER_EXE),
+            "-m", os.path.join(SCRIPT_DIR, MODEL_PATH),
+            "-t", str(WHISPER_THREADS),
+            "-mc", "0",  # Each clip is independent, no text context to carry
+            "-nt",
+            "-np"
+        )
+        # Reused WAV path for the file fallback, overwritten on each recording
+        self.temp_wav_path = os.path.join(tempfile.gettempdir(), f"ghostwriter_{os.getpid()}.wav")
+        # Set once the startup warmup run has finished (see warmup_whisper)
+        self.whisper_warm = threading.Event()
 
         # Threading
-        self.kb = Controller()
+        self.kb = None  # pynput Controller, created in start_services
+        self.services_started = False  # Set once start_services has run
         self.keyboard_listener = None
         self.audio_stream = None
         self.tray_icon = None
+        self.tray_icons = {}  # color -> prerendered tray image
+        self.record_item_text = "Start Recording"  # Tray menu label, set on state change
         self.update_queue = queue.Queue()
 
-        # Modifier key tracking for combo hotkeys
-        self.ctrl_pressed = False
-        self.shift_pressed = False
-        self.alt_pressed = False
+        # One long-lived thread plays beeps, so the hotkey path never spawns threads
+        self.beep_queue = queue.SimpleQueue()
+        threading.Thread(target=self._beep_worker, daemon=True).start()
+
+        # Likewise one thread transcribes and pastes finished recordings, in order
+        self.work_queue = queue.Queue(maxsize=4)  # (buffer, frames)
+        threading.Thread(target=self._transcribe_worker, daemon=True).start()
+
+        # Modifier key tracking for combo hotkeys (MOD_* bits)
+        self.modifiers = 0
+        self.modifier_keys = {}  # pynput Key -> MOD_* bit, filled in start_services
+        # Per-keystroke hotkey test, rebuilt when the hotkey changes (see compile_hotkey)
+        self.hotkey_match = None
 
         # GUI
         self.root = None
@@ -378,7 +526,9 @@ class GhostWriterApp:
         self.status_circle = None
         self.status_label = None
         self.transcription_text = None
+        self.transcription_shown = None  # Text currently in transcription_text
         self.ghost_indicator = None  # Floating popup (created after root)
+        self._save_after_id = None  # Pending debounced settings save
 
         # Check for required files
         self.files_ok = self.check_files_exist()
@@ -399,13 +549,33 @@ class GhostWriterApp:
 
     def save_settings(self):
         """Save current settings to settings.json"""
+        # Writing now supersedes any pending debounced save
+        if self._save_after_id:
+            try:
+                self.root.after_cancel(self._save_after_id)
+            except Exception:
+                pass
+            self._save_after_id = None
+
         settings_path = os.path.join(SCRIPT_DIR, SETTINGS_FILE)
+        tmp_path = settings_path + ".tmp"
         try:
-            with open(settings_path, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            # One write to a temp file, then an atomic swap into place
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(self.settings))
+            os.replace(tmp_path, settings_path)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
+    def schedule_save_settings(self):
+        """Save settings after a short delay, coalescing repeated changes"""
+        if not self.root:
+            self.save_settings()
+            return
+        if self._save_after_id:
+            self.root.after_cancel(self._save_after_id)
+        self._save_after_id = self.root.after(SETTINGS_SAVE_DELAY_MS, self.save_settings)
+
     def check_files_exist(self):
         """Verify that required files are present"""
         whisper_path = os.path.join(SCRIPT_DIR, WHISPER_EXE)
@@ -437,7 +607,6 @@ class GhostWriterApp:
         """Build the modern GUI with customtkinter"""
         # FIX: Taskbar Icon for Windows
         try:
-            import ctypes
             myappid = 'antigravity.ghostwriter.gui.1.0' # Arbitrary string
             ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
         except:
@@ -483,6 +652,7 @@ class GhostWriterApp:
         self.transcription_text.pack(fill='x', pady=(20, 20))
         self.transcription_text.insert("0.0", "Press F8 to dictate...")
         self.transcription_text.configure(state="disabled")
+        self.transcription_shown = "Press F8 to dictate..."
 
         # ===== SETTINGS CARD =====
         settings_frame = ctk.CTkFrame(main_frame, corner_radius=20)
@@ -510,10 +680,10 @@ class GhostWriterApp:
 
         # Paste Speed
         r2 = add_row(settings_frame, "Paste Speed")
-        current_delay = self.settings.get("paste_delay", 0.15)
+        current_delay = self.settings.get("paste_delay", 0.0)
         # Map values to labels
         delay_map = {v: k for k, v in PASTE_DELAY_OPTIONS}
-        current_label = delay_map.get(current_delay, "Normal (0.15s)")
+        current_label = delay_map.get(current_delay, PASTE_DELAY_OPTIONS[0][0])
         
         self.delay_var = ctk.StringVar(value=current_label)
         # Extract just labels for the combobox
@@ -566,51 +736,47 @@ class GhostWriterApp:
         # System Protocol
         self.root.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
 
+        # Background threads wake the Tk loop with this event when they queue updates
+        self.root.bind('<<GWUpdate>>', lambda e: self.drain_updates())
+
         # Initial Status Update
-        self.poll_updates()
+        self.drain_updates()
         if not self.files_ok:
             self.update_status(STATUS_ERROR, self.error_message)
 
     def _update_status_ui(self, state, message=""):
         """Update status indicator"""
-        colors = {
-            STATUS_READY: '#888888',
-            STATUS_RECORDING: '#4CAF50',
-            STATUS_TRANSCRIBING: '#FFC107',
-            STATUS_ERROR: '#F44336'
-        }
-        
-        color = colors.get(state, '#888888')
+        color = STATUS_COLORS.get(state, '#888888')
         # Update dot color (CTkFrame fg_color)
         self.status_dot.configure(fg_color=color)
+        # Tray icon follows the status (images are prerendered per color)
+        self.update_tray_icon_color(color)
 
         hotkey = self.settings.get("hotkey", "F8")
         
         if state == STATUS_READY:
             self.status_label.configure(text="Ready", text_color="white")
-            self.transcription_text.configure(state="normal")
-            self.transcription_text.delete("0.0", "end")
-            self.transcription_text.insert("0.0", f"Press {hotkey} to start listening...")
-            self.transcription_text.configure(state="disabled")
+            self._update_transcription_ui(f"Press {hotkey} to start listening...")
         elif state == STATUS_RECORDING:
             self.status_label.configure(text="Listening...", text_color="#4CAF50")
         elif state == STATUS_TRANSCRIBING:
             self.status_label.configure(text="Thinking...", text_color="#FFC107")
         elif state == STATUS_ERROR:
             self.status_label.configure(text="Error", text_color="#F44336")
-            self.transcription_text.configure(state="normal")
-            self.transcription_text.delete("0.0", "end")
-            self.transcription_text.insert("0.0", message)
-            self.transcription_text.configure(state="disabled")
+            self._update_transcription_ui(message)
 
     def _update_transcription_ui(self, text):
+        # Skip the delete/insert repaint if the box already shows this text
+        if text == self.transcription_shown:
+            return
+        self.transcription_shown = text
         self.transcription_text.configure(state="normal")
         self.transcription_text.delete("0.0", "end")
         self.transcription_text.insert("0.0", text)
         self.transcription_text.configure(state="disabled")
 
-    def poll_updates(self):
-        """Poll the update queue for thread-safe GUI updates"""
+    def drain_updates(self):
+        """Apply all queued thread-safe GUI updates"""
         try:
             while True:
                 update = self.update_queue.get_nowait()
@@ -621,9 +787,13 @@ class GhostWriterApp:
         except queue.Empty:
             pass
 
-        # Schedule next poll
+    def _notify_gui(self):
+        """Ask the Tk loop to drain the update queue (safe from any thread)"""
         if self.root:
-            self.root.after(50, self.poll_updates)
+            try:
+                self.root.event_generate('<<GWUpdate>>', when='tail')
+            except (RuntimeError, tk.TclError):
+                pass  # Window already destroyed
 
 
 
@@ -631,11 +801,13 @@ class GhostWriterApp:
         """Thread-safe status update"""
         self.current_status = state
         self.update_queue.put(("status", state, message))
+        self._notify_gui()
 
     def update_transcription(self, text):
         """Thread-safe transcription update"""
         self.last_transcription = text
         self.update_queue.put(("transcription", text))
+        self._notify_gui()
 
     # ===== SETTINGS HANDLERS =====
 
@@ -644,18 +816,20 @@ class GhostWriterApp:
         new_hotkey = choice  # Use the passed argument directly
         
         self.settings["hotkey"] = new_hotkey
-        self.save_settings()
+        self.schedule_save_settings()
 
         # Update hint text
         self._update_status_ui(self.current_status)
 
-        # Restart keyboard listener with new hotkey
-        self.restart_keyboard_listener()
+        # Restart keyboard listener with new hotkey (if not started yet,
+        # start_services picks the new one up)
+        if self.services_started:
+            self.restart_keyboard_listener()
 
     def on_sound_changed(self):
         """Handle sound toggle change"""
         self.settings["sound_enabled"] = self.sound_var.get()
-        self.save_settings()
+        self.schedule_save_settings()
 
     def on_delay_changed(self, event=None):
         """Handle paste delay change"""
@@ -663,19 +837,20 @@ class GhostWriterApp:
         for lbl, val in PASTE_DELAY_OPTIONS:
             if lbl == label:
                 self.settings["paste_delay"] = val
+                self.paste_delay = val
                 break
-        self.save_settings()
+        self.schedule_save_settings()
 
     def on_minimized_changed(self):
         """Handle start minimized toggle"""
         self.settings["start_minimized"] = self.minimized_var.get()
-        self.save_settings()
+        self.schedule_save_settings()
 
     def on_startup_changed(self):
         """Handle run on startup toggle"""
         enabled = self.startup_var.get()
         self.settings["run_on_startup"] = enabled
-        self.save_settings()
+        self.schedule_save_settings()
         self.update_startup_registry(enabled)
 
     def update_startup_registry(self, enabled):
@@ -684,7 +859,14 @@ class GhostWriterApp:
         app_name = "GhostWriter"
 
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0,
+                                 winreg.KEY_QUERY_VALUE | winreg.KEY_SET_VALUE)
+
+            # Read the current entry so unchanged settings don't rewrite the registry
+            try:
+                existing, _ = winreg.QueryValueEx(key, app_name)
+            except FileNotFoundError:
+                existing = None
 
             if enabled:
                 # Get pythonw.exe path and script path
@@ -697,12 +879,10 @@ class GhostWriterApp:
                     script_path = os.path.abspath(__file__)
                     app_path = f'"{pythonw}" "{script_path}"'
 
-                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_path)
-            else:
-                try:
-                    winreg.DeleteValue(key, app_name)
-                except FileNotFoundError:
-                    pass  # Already doesn't exist
+                if existing != app_path:
+                    winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_path)
+            elif existing is not None:
+                winreg.DeleteValue(key, app_name)
 
             winreg.CloseKey(key)
         except Exception as e:
@@ -731,14 +911,14 @@ class GhostWriterApp:
 
     def create_tray_icon(self):
         """Create system tray icon with pystray"""
-        image = self.create_tray_icon_image()
+        # Render every status color once; status changes just swap images
+        self.tray_icons = {color: self.create_tray_icon_image(color)
+                           for color in STATUS_COLORS.values()}
+        image = self.tray_icons[STATUS_COLORS[STATUS_READY]]
 
         menu = pystray.Menu(
             pystray.MenuItem("Show Window", self.show_window, default=True),
-            pystray.MenuItem(
-                lambda item: "Stop Recording" if self.is_recording else "Start Recording",
-                self.toggle_recording
-            ),
+            pystray.MenuItem(lambda item: self.record_item_text, self.toggle_recording),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Quit", self.quit_app)
         )
@@ -749,7 +929,19 @@ class GhostWriterApp:
         """Update the tray icon color"""
         if self.tray_icon and self.tray_icon.visible:
             try:
-                self.tray_icon.icon = self.create_tray_icon_image(color)
+                image = self.tray_icons.get(color)
+                if image is None:
+                    image = self.tray_icons[color] = self.create_tray_icon_image(color)
+                self.tray_icon.icon = image
+            except Exception:
+                pass  # Ignore errors if tray not ready
+
+    def set_tray_record_label(self, text):
+        """Set the tray menu's record item label and refresh the menu"""
+        self.record_item_text = text
+        if self.tray_icon:
+            try:
+                self.tray_icon.update_menu()
             except Exception:
                 pass  # Ignore errors if tray not ready
 
@@ -782,19 +974,49 @@ class GhostWriterApp:
 
     # ===== AUDIO & RECORDING =====
 
+    def _beep_worker(self):
+        """Play queued (frequency, duration) beeps one after another"""
+        while True:
+            frequency, duration = self.beep_queue.get()
+            try:
+                winsound.Beep(frequency, duration)
+            except RuntimeError:
+                pass  # No sound device
+
+    def _transcribe_worker(self):
+        """Process queued recordings one after another"""
+        while True:
+            buffer, frames = self.work_queue.get()
+            try:
+                self.process_recording(buffer, frames)
+            except Exception as e:
+                # Lose this recording, not the worker (and every later one)
+                self.update_status(STATUS_ERROR, str(e))
+                if self.ghost_indicator:
+                    self.root.after(0, self.ghost_indicator.hide)
+
     def audio_callback(self, indata, frames, time_info, status):
         """Called by sounddevice for each audio chunk"""
         if self.is_recording:
-            self.audio_data.append(indata.copy())
+            start = self.audio_frames
+            end = start + frames
+            if end > len(self.audio_buffer):
+                # Longer than the preallocated buffer, double it
+                self.audio_buffer = np.resize(self.audio_buffer, max(end, 2 * len(self.audio_buffer)))
+            self.audio_buffer[start:end] = indata[:, 0]
+            self.audio_frames = end
 
     def start_recording(self):
         """Begin audio capture"""
         if not self.files_ok:
             return
 
+        # Pooled buffer; the previous one goes back only once it's been encoded
+        self.audio_buffer = self.acquire_audio_buffer()
+        self.audio_frames = 0
         self.is_recording = True
-        self.audio_data = []
         self.update_status(STATUS_RECORDING)
+        self.set_tray_record_label("Stop Recording")
 
         # Show ghost indicator
         if self.ghost_indicator:
@@ -802,7 +1024,7 @@ class GhostWriterApp:
 
         # Play start sound
         if self.settings.get("sound_enabled", True):
-            threading.Thread(target=lambda: winsound.Beep(*START_BEEP), daemon=True).start()
+            self.beep_queue.put(START_BEEP)
 
     def stop_recording(self):
         """Stop audio capture and transcribe"""
@@ -810,26 +1032,50 @@ class GhostWriterApp:
             return
 
         self.is_recording = False
+        self.set_tray_record_label("Start Recording")
 
         # Play stop sound
         if self.settings.get("sound_enabled", True):
-            threading.Thread(target=lambda: winsound.Beep(*STOP_BEEP), daemon=True).start()
-
-        # Process in background thread
-        threading.Thread(target=self.process_recording, daemon=True).start()
+            self.beep_queue.put(STOP_BEEP)
 
-    def process_recording(self):
+        # Hand off to the transcription worker. If it has fallen that far
+        # behind (hotkey spamming), the oldest waiting recording is dropped.
+        item = (self.audio_buffer, self.audio_frames)
+        while True:
+            try:
+                self.work_queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    dropped_buffer, _ = self.work_queue.get_nowait()
+                    self.release_audio_buffer(dropped_buffer)
+                except queue.Empty:
+                    pass
+
+    def acquire_audio_buffer(self):
+        """Take a recording buffer from the pool, or allocate one"""
+        with self.buffer_pool_lock:
+            if self.buffer_pool:
+                return self.buffer_pool.pop()
+        return np.empty(SAMPLE_RATE * RECORD_BUFFER_SECONDS, dtype=np.int16)
+
+    def release_audio_buffer(self, buffer):
+        """Return a recording buffer to the pool (only the standard size is kept)"""
+        if len(buffer) == SAMPLE_RATE * RECORD_BUFFER_SECONDS:
+            with self.buffer_pool_lock:
+                self.buffer_pool.append(buffer)
+
+    def process_recording(self, buffer, frames):
         """Process recorded audio"""
-        if len(self.audio_data) == 0:
-            self.update_status(STATUS_READY)
-            if self.ghost_indicator:
-                self.root.after(0, self.ghost_indicator.hide)
-            return
+        duration = frames / SAMPLE_RATE
 
-        recording = np.concatenate(self.audio_data, axis=0)
-        duration = len(recording) / SAMPLE_RATE
+        # The WAV holds its own copy of the samples, so the buffer can be
+        # reused by the next recording right away
+        wav_data = wav_bytes_pcm16(buffer[:frames]) if duration >= 0.5 else None
+        self.release_audio_buffer(buffer)
 
-        if duration < 0.5:
+        # Nothing (or too little) recorded
+        if wav_data is None:
             self.update_status(STATUS_READY)
             if self.ghost_indicator:
                 self.root.after(0, self.ghost_indicator.hide)
@@ -841,23 +1087,26 @@ class GhostWriterApp:
         if self.ghost_indicator:
             self.root.after(0, lambda: self.ghost_indicator.show('transcribing'))
 
-        temp_wav = tempfile.mktemp(suffix=".wav")
-
         try:
-            wav.write(temp_wav, SAMPLE_RATE, recording)
-            text = self.transcribe(temp_wav)
+            # Don't race the warmup run for the CPU; it's nearly done anyway
+            self.whisper_warm.wait()
+
+            if duration > WHISPER_STREAM_SECONDS and self.whisper_reads_stdin is not None:
+                # Long clip: pasted piece by piece while whisper works
+                text = self.transcribe_streaming(wav_data, duration)
+                if text:
+                    self.update_transcription(text)
+            else:
+                text = self.transcribe(wav_data, duration)
 
-            if text:
-                self.update_transcription(text)
-                self.type_text(text)
+                if text:
+                    self.update_transcription(text)
+                    self.type_text(text)
         except Exception as e:
             self.update_status(STATUS_ERROR, str(e))
             if self.ghost_indicator:
                 self.root.after(0, self.ghost_indicator.hide)
             return
-        finally:
-            if os.path.exists(temp_wav):
-                os.remove(temp_wav)
 
         self.update_status(STATUS_READY)
         
@@ -865,107 +1114,180 @@ class GhostWriterApp:
         if self.ghost_indicator:
             self.root.after(0, self.ghost_indicator.hide)
 
-    def transcribe(self, audio_file):
-        """Run whisper.exe and return text"""
+    def whisper_args(self, audio_file, duration):
+        """Full whisper.exe command line for audio_file"""
+        command = [*self.whisper_command, "-f", audio_file]
+
+        # Short dictation doesn't need the encoder to process 30s of padding
+        if duration < WHISPER_SHORT_AUDIO_SECONDS:
+            command += ["-ac", str(WHISPER_SHORT_AUDIO_CTX)]
+
+        return command
+
+    def run_whisper(self, audio_file, duration, input_data=None, capture_stderr=False):
+        """Run whisper.exe on audio_file ("-" reads input_data from stdin)"""
+        return subprocess.run(
+            self.whisper_args(audio_file, duration),
+            input=input_data,
+            stdout=subprocess.PIPE,
+            # stderr is only progress/timing logs, wanted just for the stdin check
+            stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+            # The user is waiting on this run, so let it win over background work
+            creationflags=subprocess.CREATE_NO_WINDOW | subprocess.ABOVE_NORMAL_PRIORITY_CLASS
+        )
+
+    def transcribe(self, wav_data, duration):
+        """Run whisper.exe on in-memory WAV data (duration in seconds) and return text"""
         try:
-            command = [
-                os.path.join(SCRIPT_DIR, WHISPER_EXE),
-                "-m", os.path.join(SCRIPT_DIR, MODEL_PATH),
-                "-f", audio_file,
-                "-nt",
-                "-np"
-            ]
-
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            result = None
+
+            # Pipe the audio straight in, skipping the temp file round trip
+            if self.whisper_reads_stdin is not False:
+                probing = self.whisper_reads_stdin is None
+                result = self.run_whisper("-", duration, wav_data, capture_stderr=probing)
+                if probing:
+                    # Older whisper builds only read files, stick to that from now on
+                    self.whisper_reads_stdin = (result.returncode == 0
+                                                and b"failed to read" not in result.stderr)
+                    if not self.whisper_reads_stdin:
+                        result = None
+
+            if result is None:
+                with open(self.temp_wav_path, 'wb') as f:
+                    f.write(wav_data)
+                result = self.run_whisper(self.temp_wav_path, duration)
 
             if result.returncode != 0:
                 return None
 
-            return result.stdout.strip()
+            return result.stdout.decode("utf-8", errors="replace").strip()
 
         except Exception as e:
             print(f"Transcription error: {e}")
             return None
 
+    def transcribe_streaming(self, wav_data, duration):
+        """Run whisper.exe, pasting text as it is printed, and return the full text"""
+        # whisper-cli flushes stdout after each segment (with -nt there are no
+        # newlines between them), so read whatever has arrived rather than lines
+        if self.whisper_reads_stdin:
+            audio_file, input_data = "-", wav_data
+        else:
+            with open(self.temp_wav_path, 'wb') as f:
+                f.write(wav_data)
+            audio_file, input_data = self.temp_wav_path, None
+
+        process = subprocess.Popen(
+            self.whisper_args(audio_file, duration),
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW | subprocess.ABOVE_NORMAL_PRIORITY_CLASS
+        )
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pasted = ""
+        held = ""  # Trailing whitespace, pasted only if more text follows
+        try:
+            # whisper reads all of its input before printing anything, so the
+            # write can't block on a full stdout pipe
+            if input_data is not None:
+                try:
+                    with process.stdin:
+                        process.stdin.write(input_data)
+                except OSError:
+                    pass  # whisper exited early; the return code below says so
+
+            while True:
+                data = process.stdout.read1(65536)
+                if not data:
+                    break
+
+                text = held + decoder.decode(data)
+                if not pasted:
+                    text = text.lstrip()
+                piece = text.rstrip()
+                held = text[len(piece):]
+                if piece:
+                    self.paste_text(piece)
+                    pasted += piece
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        if process.returncode != 0:
+            raise RuntimeError(f"whisper exited with code {process.returncode}")
+
+        return pasted
+
+    def warmup_whisper(self):
+        """Transcribe half a second of silence so the first real recording starts warm"""
+        # Pages the model in and settles the stdin check before the user
+        # presses the hotkey; the output is thrown away
+        try:
+            if self.files_ok:
+                silence = np.zeros(SAMPLE_RATE // 2, dtype=np.int16)
+                self.transcribe(wav_bytes_pcm16(silence), len(silence) / SAMPLE_RATE)
+        finally:
+            self.whisper_warm.set()
+
     def type_text(self, text):
         """Paste text using clipboard method"""
         if not text or text.isspace():
             return
 
-        text = text.strip()
-
-        # Save old clipboard
-        try:
-            old_clipboard = pyperclip.paste()
-        except:
-            old_clipboard = ""
+        self.paste_text(text.strip())
 
-        # Copy new text
+    def paste_text(self, text):
+        """Put text on the clipboard and paste it as-is"""
+        # Copy new text (pyperclip sets the clipboard synchronously on
+        # Windows), then give slow targets the Paste Speed delay
         pyperclip.copy(text)
-        time.sleep(self.settings.get("paste_delay", 0.15))
+        if self.paste_delay:
+            time.sleep(self.paste_delay)
 
-        # Paste with Ctrl+V
-        with self.kb.pressed(Key.ctrl):
-            self.kb.press('v')
-            self.kb.release('v')
+        # Paste with Ctrl+V (pynput if SendInput was refused, e.g. by UIPI)
+        if not send_ctrl_v():
+            with self.kb.pressed(Key.ctrl):
+                self.kb.press('v')
+                self.kb.release('v')
 
     # ===== KEYBOARD LISTENER =====
 
-    def get_hotkey_key(self):
-        """Convert hotkey string to pynput Key object(s)"""
-        hotkey = self.settings.get("hotkey", "F8")
-
+    def parse_hotkey(self, hotkey):
+        """Convert a hotkey string to (required MOD_* bits, pynput Key or virtual-key code)"""
         # Function keys
         if hotkey.startswith("F") and hotkey[1:].isdigit():
-            return getattr(Key, hotkey.lower(), Key.f8)
-
-        # Combo keys - return the main key, modifiers handled separately
-        if hotkey == "Ctrl+Shift+R":
-            return "r"
-        elif hotkey == "Ctrl+Shift+D":
-            return "d"
-        elif hotkey == "Ctrl+Alt+V":
-            return "v"
+            return 0, getattr(Key, hotkey.lower(), Key.f8)
 
-        return Key.f8
+        # Combo keys, e.g. "Ctrl+Shift+R"
+        *mods, char = hotkey.split("+")
+        mask = 0
+        for mod in mods:
+            mask |= HOTKEY_MODIFIERS.get(mod, 0)
+        # A letter's virtual-key code is its uppercase ASCII code
+        return mask, ord(char.upper())
 
-    def is_hotkey_pressed(self, key):
-        """Check if the pressed key matches the current hotkey"""
-        hotkey = self.settings.get("hotkey", "F8")
+    def compile_hotkey(self, hotkey):
+        """Build the function that tests a key event against the hotkey"""
+        mask, target = self.parse_hotkey(hotkey)
 
-        # Function keys
-        if hotkey.startswith("F") and hotkey[1:].isdigit():
-            expected = getattr(Key, hotkey.lower(), Key.f8)
-            return key == expected
+        # Function keys: pynput passes the same Key member every time
+        if not mask:
+            return lambda key: key is target
 
-        # Combo keys
-        if hotkey == "Ctrl+Shift+R":
-            return self.ctrl_pressed and self.shift_pressed and hasattr(key, 'char') and key.char == 'r'
-        elif hotkey == "Ctrl+Shift+D":
-            return self.ctrl_pressed and self.shift_pressed and hasattr(key, 'char') and key.char == 'd'
-        elif hotkey == "Ctrl+Alt+V":
-            return self.ctrl_pressed and self.alt_pressed and hasattr(key, 'char') and key.char == 'v'
-
-        return False
+        # Combos: compare virtual-key codes. With Ctrl held, pynput reports a
+        # control character such as "\x12" rather than "r", so comparing
+        # chars would miss.
+        return lambda key: getattr(key, 'vk', None) == target and (self.modifiers & mask) == mask
 
     def on_key_press(self, key):
         """Handle key press events"""
-        # Track modifier keys
-        if key == Key.ctrl_l or key == Key.ctrl_r:
-            self.ctrl_pressed = True
-        elif key == Key.shift_l or key == Key.shift_r or key == Key.shift:
-            self.shift_pressed = True
-        elif key == Key.alt_l or key == Key.alt_r or key == Key.alt_gr:
-            self.alt_pressed = True
+        # Track modifier keys (non-modifiers map to 0, a no-op)
+        self.modifiers |= self.modifier_keys.get(key, 0)
 
         # Check if hotkey pressed
-        if self.is_hotkey_pressed(key):
+        if self.hotkey_match(key):
             if not self.is_recording:
                 self.start_recording()
             else:
@@ -973,26 +1295,36 @@ class GhostWriterApp:
 
     def on_key_release(self, key):
         """Handle key release events"""
-        if key == Key.ctrl_l or key == Key.ctrl_r:
-            self.ctrl_pressed = False
-        elif key == Key.shift_l or key == Key.shift_r or key == Key.shift:
-            self.shift_pressed = False
-        elif key == Key.alt_l or key == Key.alt_r or key == Key.alt_gr:
-            self.alt_pressed = False
+        self.modifiers &= ~self.modifier_keys.get(key, 0)
 
-    def start_keyboard_listener(self):
-        """Start the keyboard listener"""
+    def start_audio_stream(self):
+        """Open the microphone stream for the whole session"""
+        # Kept running between recordings; audio_callback only stores
+        # samples while is_recording is set
         try:
-            # Start audio stream
             self.audio_stream = sd.InputStream(
                 callback=self.audio_callback,
                 channels=1,
                 samplerate=SAMPLE_RATE,
-                dtype=np.float32
+                blocksize=AUDIO_BLOCKSIZE,
+                dtype=np.int16  # Whisper gets 16-bit PCM, so capture it as-is
             )
             self.audio_stream.start()
+        except Exception as e:
+            self.update_status(STATUS_ERROR, f"Failed to start: {e}")
 
-            # Start keyboard listener
+    def stop_audio_stream(self):
+        """Close the microphone stream"""
+        if self.audio_stream:
+            self.audio_stream.stop()
+            self.audio_stream.close()
+            self.audio_stream = None
+
+    def start_keyboard_listener(self):
+        """Start the keyboard listener"""
+        try:
+            # Start keyboard listener (hotkey parsed once, not per key event)
+            self.hotkey_match = self.compile_hotkey(self.settings.get("hotkey", "F8"))
             self.keyboard_listener = keyboard.Listener(
                 on_press=self.on_key_press,
                 on_release=self.on_key_release
@@ -1007,11 +1339,6 @@ class GhostWriterApp:
             self.keyboard_listener.stop()
             self.keyboard_listener = None
 
-        if self.audio_stream:
-            self.audio_stream.stop()
-            self.audio_stream.close()
-            self.audio_stream = None
-
     def restart_keyboard_listener(self):
         """Restart keyboard listener with new hotkey"""
         self.stop_keyboard_listener()
@@ -1027,6 +1354,7 @@ class GhostWriterApp:
 
         # Stop listeners
         self.stop_keyboard_listener()
+        self.stop_audio_stream()
 
         # Stop tray icon
         if self.tray_icon:
@@ -1035,11 +1363,49 @@ class GhostWriterApp:
         # Save settings
         self.save_settings()
 
+        # Remove the fallback WAV, if one was ever written
+        try:
+            os.remove(self.temp_wav_path)
+        except OSError:
+            pass
+
         # Close window
         if self.root:
             self.root.quit()
             self.root.destroy()
 
+    def load_services(self):
+        """Import deferred modules off the Tk thread, then start services on it"""
+        # The window stays responsive (and gets painted) during the imports
+        try:
+            load_deferred_modules()
+        except Exception as e:
+            # e.g. a missing package, or OSError when PortAudio can't load
+            self.update_status(STATUS_ERROR, f"Failed to start: {e}")
+            return
+        self.root.after(0, self.start_services)
+
+    def start_services(self):
+        """Start the tray icon and listeners (deferred modules must be loaded)"""
+        self.kb = Controller()
+        self.modifier_keys = {
+            Key.ctrl_l: MOD_CTRL, Key.ctrl_r: MOD_CTRL,
+            Key.shift: MOD_SHIFT, Key.shift_l: MOD_SHIFT, Key.shift_r: MOD_SHIFT,
+            Key.alt_l: MOD_ALT, Key.alt_r: MOD_ALT, Key.alt_gr: MOD_ALT,
+        }
+
+        # Create and start tray icon (run_detached handles its own thread)
+        self.create_tray_icon()
+        self.run_tray_icon()
+
+        # Open the microphone once, then start the keyboard listener
+        self.start_audio_stream()
+        self.start_keyboard_listener()
+
+        # Warm whisper up in the background
+        threading.Thread(target=self.warmup_whisper, daemon=True).start()
+        self.services_started = True
+
     def run(self):
         """Start the application"""
         # Create GUI
@@ -1051,17 +1417,13 @@ class GhostWriterApp:
         # Create ghost indicator (floating popup)
         self.ghost_indicator = GhostIndicator(self.root)
 
-        # Create and start tray icon (run_detached handles its own thread)
-        self.create_tray_icon()
-        self.run_tray_icon()
-
-        # Start keyboard listener
-        self.start_keyboard_listener()
-
         # Handle start minimized
         if self.settings.get("start_minimized", False):
             self.root.withdraw()
 
+        # Load the heavy modules in the background, then start services
+        threading.Thread(target=self.load_services, daemon=True).start()
+
         # Run tkinter main loop
         try:
             self.root.mainloop()
@@ -1069,10 +1431,6 @@ class GhostWriterApp:
             self.quit_app()
 
 
-# Need to import time for paste delay
-import time
-
-
 # ============== ENTRY POINT ==============
 if __name__ == "__main__":
     app = GhostWriterApp()